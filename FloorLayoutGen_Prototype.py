@@ -5,13 +5,66 @@ from ttkbootstrap.constants import *
 import matplotlib.pyplot as plt
 from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg, NavigationToolbar2Tk
 import matplotlib.patches as patches
+from matplotlib.path import Path
+from matplotlib.collections import PolyCollection
+from matplotlib.colors import to_rgba
+import numpy as np
+from collections import deque
+import bisect
+import functools
 import random
 import textwrap
 
+try:
+    from numba import njit
+except ImportError: # numba is optional; the NumPy fallbacks below are used instead
+    njit = None
+
+# --- Tuning Constants ---
+MAX_UNDO_STEPS = 500 # oldest history entries are dropped beyond this
+NUDGE_COMMIT_DELAY_MS = 250 # arrow-key quiet time before a run of nudges becomes one undo step
+GRID_CELL_SIZE = 5 # feet per spatial-index cell
+GRID_MAX_CELLS = 10 # items spanning more cells than this are hit-tested linearly instead
+MIN_LABEL_PX = (30, 15) # labels are hidden on items smaller than this on screen (width, height)
+
+# --- Theme ---
+PALETTE = {
+    'bg': '#2B3E50', 'text': '#EAEAEA', 'grid': '#4E6A85', 
+    'room_face': '#34495E', 'room_edge': '#9CC2E5', 'selected_edge': '#18BC9C',
+    'obj_face': '#8E44AD', 'obj_edge': '#BD93D8', 'selected_obj_edge': '#F39C12',
+}
+
+# --- Geometry Helpers ---
+def _points_in_rects_np(xywh, px, py):
+    """Returns a boolean mask of the (N, 4) x/y/width/height rows that contain the point."""
+    x, y, w, h = xywh.T
+    return (x <= px) & (px <= x + w) & (y <= py) & (py <= y + h)
+
+def _points_in_rects_loop(xywh, px, py):
+    """Loop form of the hit-test mask for numba; a single pass with no temporary arrays."""
+    out = np.empty(xywh.shape[0], np.bool_)
+    for i in range(xywh.shape[0]):
+        x, y, w, h = xywh[i, 0], xywh[i, 1], xywh[i, 2], xywh[i, 3]
+        out[i] = x <= px <= x + w and y <= py <= y + h
+    return out
+
+_points_in_rects = njit(cache=True)(_points_in_rects_loop) if njit else _points_in_rects_np
+
+def _rect_verts(xywh):
+    """Converts (N, 4) x/y/width/height rows into (N, 4, 2) corner arrays for a PolyCollection."""
+    xy, wh = xywh[:, None, :2], np.maximum(xywh[:, None, 2:], 0.1)
+    return xy + wh * np.array([[0, 0], [1, 0], [1, 1], [0, 1]])
+
+@functools.lru_cache(maxsize=256)
+def _wrap_name(name, chars_per_line):
+    """Wraps a room name to the given line length; cached since names and widths rarely change between draws."""
+    return '\n'.join(textwrap.wrap(name, width=chars_per_line, break_long_words=True, break_on_hyphens=False))
+
 # --- Data Class for a Room ---
 class Room:
     """Represents a single room with position and dimensions."""
     def __init__(self, name, x, y, width, height):
+        self.kind = 'room' # Cheap type tag for dispatch in event handlers
         self.update_state((name, x, y, width, height))
 
     def get_state(self):
@@ -19,12 +72,14 @@ class Room:
 
     def update_state(self, state_tuple):
         self.name, self.x, self.y, self.width, self.height = state_tuple
+        self._bbox = (self.x, self.y, self.x + self.width, self.y + self.height) # Cached for hit-testing
 
     def contains(self, px, py):
-        return self.x <= px <= self.x + self.width and self.y <= py <= self.y + self.height
+        x1, y1, x2, y2 = self._bbox
+        return x1 <= px <= x2 and y1 <= py <= y2
 
     def get_resize_handle(self, px, py, tolerance=5): #! MODIFIED: Increased tolerance for easier grabbing
-        l, r, b, t = self.x, self.x + self.width, self.y, self.y + self.height
+        l, b, r, t = self._bbox
         on_l, on_r = abs(px - l) < tolerance, abs(px - r) < tolerance
         on_b, on_t = abs(py - b) < tolerance, abs(py - t) < tolerance
 
@@ -44,6 +99,7 @@ class Room:
 class BlueprintObject:
     """Represents a single object like furniture."""
     def __init__(self, name, x, y, width, height):
+        self.kind = 'obj'
         self.update_state((name, x, y, width, height))
 
     def get_state(self):
@@ -51,9 +107,11 @@ class BlueprintObject:
 
     def update_state(self, state_tuple):
         self.name, self.x, self.y, self.width, self.height = state_tuple
+        self._bbox = (self.x, self.y, self.x + self.width, self.y + self.height) # Cached for hit-testing
 
     def contains(self, px, py):
-        return self.x <= px <= self.x + self.width and self.y <= py <= self.y + self.height
+        x1, y1, x2, y2 = self._bbox
+        return x1 <= px <= x2 and y1 <= py <= y2
 
 # --- Base Dialog Class ---
 class BaseDialog(tk.Toplevel):
@@ -142,13 +200,28 @@ class BlueprintApp(ttk.Window):
 
         self.house, self.furnishings = [], []
         self.selected_item = None
-        self.history, self.redo_stack = [], []
+        self.history, self.redo_stack = deque(maxlen=MAX_UNDO_STEPS), deque(maxlen=MAX_UNDO_STEPS)
         self.clipboard = None
         self.current_action, self.action_start_xy, self.ghost_rect = None, None, None
-        self.object_to_add = None
+        self.object_to_add, self._object_to_add_wh = None, None
         self.draw_mode_active = tk.BooleanVar(value=False)
         self.original_state = None
         self.resize_handle = None
+        self._labels = {} # item -> Text, kept alive across redraws
+        self._labels_scale = None # Pixels per foot the label visibility was last evaluated at
+        self._view_check_pending = False
+        self._drag_item, self._bg = None, None # Item being dragged and the cached blit background
+        self._draw_pending = False
+        self._pending_nudge = None # (item, state before the current run of arrow-key nudges)
+        self._nudge_commit_id = None # after() id of the deferred _commit_nudge
+        # Struct-of-arrays mirror of item geometry (x, y, width, height), rebuilt lazily after edits
+        self.room_xywh, self.obj_xywh = np.empty((0, 4)), np.empty((0, 4))
+        self._total_sqft = 0.0 # Recomputed with the arrays, i.e. once per layout change
+        self._geometry_dirty = True
+        # Spatial index over z-ordered items (rooms, then furnishings): cell -> ranks, plus oversized items
+        self._z_items, self._grid = [], {}
+        self._overflow_ranks, self._overflow_xywh = np.empty(0, dtype=int), np.empty((0, 4))
+        _points_in_rects(self._overflow_xywh, 0.0, 0.0) # Pays any JIT compile at startup, not on the first hover
 
         self.object_templates = {
             "Bed (Queen)": (5, 6.7), "Dining Table": (6, 3.5),
@@ -174,8 +247,10 @@ class BlueprintApp(ttk.Window):
 
         self.fig = plt.Figure()
         self.ax = self.fig.add_subplot(111)
+        self._init_axes_style()
+        self._init_collections()
         self.canvas = FigureCanvasTkAgg(self.fig, master=self.canvas_frame)
-        self.toolbar = NavigationToolbar2Tk(self.canvas, self.canvas_frame, pack_toolbar=False)
+        self.toolbar = QuietToolbar(self.canvas, self.canvas_frame, pack_toolbar=False)
         self.toolbar.pack(side=tk.BOTTOM, fill=tk.X)
         self.canvas.get_tk_widget().pack(side=tk.TOP, fill=tk.BOTH, expand=True)
         
@@ -183,7 +258,34 @@ class BlueprintApp(ttk.Window):
         self.canvas.mpl_connect('motion_notify_event', self.on_motion)
         self.canvas.mpl_connect('button_release_event', self.on_release)
         self.canvas.mpl_connect('scroll_event', self.on_scroll)
+        self.canvas.mpl_connect('draw_event', self._on_draw)
+        # Label visibility depends on the zoom, which wheel, toolbar, Home/Back and window resizes all change
+        self.canvas.mpl_connect('resize_event', self._on_view_changed)
+        self.ax.callbacks.connect('xlim_changed', self._on_view_changed)
+        self.ax.callbacks.connect('ylim_changed', self._on_view_changed)
     
+    def _init_axes_style(self):
+        # Static decorations; the axes are never cleared, so these only need setting once
+        self.fig.patch.set_facecolor(PALETTE['bg'])
+        self.ax.set_facecolor(PALETTE['bg'])
+        self.ax.tick_params(colors=PALETTE['text'], which='both')
+        for spine in self.ax.spines.values(): spine.set_edgecolor(PALETTE['grid'])
+        
+        self.ax.set_title("FloorLayoutGen", color=PALETTE['text'], weight='bold', fontsize=16)
+        self.ax.set_xlabel("Width (feet)", color=PALETTE['text'])
+        self.ax.set_ylabel("Height (feet)", color=PALETTE['text'])
+        self.ax.set_aspect('equal', adjustable='box')
+        self.ax.grid(True, linestyle='--', color=PALETTE['grid'], alpha=0.6, zorder=0)
+
+    def _init_collections(self):
+        # All rooms (and all furnishings) are drawn by a single collection each, restyled row by row
+        self._room_collection = PolyCollection([], zorder=2)
+        self._obj_collection = PolyCollection([], zorder=4)
+        self.ax.add_collection(self._room_collection, autolim=False)
+        self.ax.add_collection(self._obj_collection, autolim=False)
+        # Animated selection outline, blitted over the cached background (filled in while dragging)
+        self._highlight = self.ax.add_artist(patches.Rectangle((0, 0), 0, 0, facecolor='none', animated=True))
+
     def _create_actions_ui(self):
         frame = ttk.LabelFrame(self.controls_frame, text="Editing Actions", padding="15")
         frame.pack(fill=tk.X, pady=(0, 10))
@@ -242,20 +344,104 @@ class BlueprintApp(ttk.Window):
         self.bind("<Down>", lambda event: self.move_selected(0, -nudge_amount))
         self.bind("<Left>", lambda event: self.move_selected(-nudge_amount, 0))
         self.bind("<Right>", lambda event: self.move_selected(nudge_amount, 0))
+        for key in ("Up", "Down", "Left", "Right"):
+            self.bind(f"<KeyRelease-{key}>", lambda event: self._schedule_nudge_commit())
         self.bind("<Escape>", lambda event: self.cancel_action())
         self.bind("<Delete>", self.delete_selected_item)
 
     def log_action(self, action):
+        self._commit_nudge()
         self.history.append(action); self.redo_stack.clear(); self.update_buttons()
+        self._geometry_dirty = True
+
+    def _sync_geometry(self):
+        """Rebuilds the NumPy geometry arrays if the layout changed since the last call."""
+        if not self._geometry_dirty: return
+        self.room_xywh = np.array([r.get_state()[1:] for r in self.house], dtype=float).reshape(-1, 4)
+        self.obj_xywh = np.array([o.get_state()[1:] for o in self.furnishings], dtype=float).reshape(-1, 4)
+        self._total_sqft = float(np.maximum(self.room_xywh[:, 2:], 0.1).prod(axis=1).sum())
+        self._build_grid()
+        self._geometry_dirty = False
+
+    def _build_grid(self):
+        self._z_items = self.house + self.furnishings
+        all_xywh = np.vstack((self.room_xywh, self.obj_xywh))
+        x0, y0 = (all_xywh[:, :2] // GRID_CELL_SIZE).astype(int).T
+        x1, y1 = ((all_xywh[:, :2] + all_xywh[:, 2:]) // GRID_CELL_SIZE).astype(int).T
+        self._grid, overflow = {}, []
+        for rank in range(len(all_xywh)):
+            if (x1[rank] - x0[rank] + 1) * (y1[rank] - y0[rank] + 1) > GRID_MAX_CELLS:
+                overflow.append(rank); continue
+            for cx in range(x0[rank], x1[rank] + 1):
+                for cy in range(y0[rank], y1[rank] + 1):
+                    self._grid.setdefault((cx, cy), []).append(rank)
+        self._overflow_ranks = np.array(overflow, dtype=int)
+        self._overflow_xywh = all_xywh[self._overflow_ranks]
+
+    def _grid_span(self, row):
+        x0, y0 = (row[:2] // GRID_CELL_SIZE).astype(int)
+        x1, y1 = ((row[:2] + row[2:]) // GRID_CELL_SIZE).astype(int)
+        return range(x0, x1 + 1), range(y0, y1 + 1), (x1 - x0 + 1) * (y1 - y0 + 1) > GRID_MAX_CELLS
+
+    def _grid_remove(self, rank, row):
+        xs, ys, oversized = self._grid_span(row)
+        if oversized:
+            keep = self._overflow_ranks != rank
+            self._overflow_ranks, self._overflow_xywh = self._overflow_ranks[keep], self._overflow_xywh[keep]
+            return
+        for cx in xs:
+            for cy in ys: self._grid[(cx, cy)].remove(rank)
+
+    def _grid_insert(self, rank, row):
+        # Cell lists and the overflow arrays stay sorted by rank so find_item_at can take the topmost hit
+        xs, ys, oversized = self._grid_span(row)
+        if oversized:
+            j = np.searchsorted(self._overflow_ranks, rank)
+            self._overflow_ranks = np.insert(self._overflow_ranks, j, rank)
+            self._overflow_xywh = np.insert(self._overflow_xywh, j, row, axis=0)
+            return
+        for cx in xs:
+            for cy in ys: bisect.insort(self._grid.setdefault((cx, cy), []), rank)
     
     def move_selected(self, dx, dy):
         if not self.selected_item: return
         
-        item_type = 'room' if isinstance(self.selected_item, Room) else 'obj'
-        old_state = self.selected_item.get_state()
-        new_state = (old_state[0], old_state[1] + dx, old_state[2] + dy, old_state[3], old_state[4])
-        self.selected_item.update_state(new_state)
-        self.log_action((f'edit_{item_type}', self.selected_item, old_state, new_state))
+        # Nudges are applied immediately but logged as one edit per run (see _commit_nudge)
+        self._cancel_nudge_commit()
+        if self._pending_nudge and self._pending_nudge[0] is not self.selected_item: self._commit_nudge()
+        if not self._pending_nudge: self._pending_nudge = (self.selected_item, self.selected_item.get_state())
+        name, x, y, w, h = self.selected_item.get_state()
+        self.selected_item.update_state((name, x + dx, y + dy, w, h))
+        self._geometry_dirty = True
+        self.schedule_redraw()
+
+    def _schedule_nudge_commit(self):
+        # X11 sends a KeyRelease/KeyPress pair on every auto-repeat tick, so only commit once the keys go quiet
+        self._cancel_nudge_commit()
+        self._nudge_commit_id = self.after(NUDGE_COMMIT_DELAY_MS, self._commit_nudge)
+
+    def _cancel_nudge_commit(self):
+        if self._nudge_commit_id is not None:
+            self.after_cancel(self._nudge_commit_id)
+            self._nudge_commit_id = None
+
+    def _commit_nudge(self):
+        """Logs the pending run of arrow-key nudges as a single edit action."""
+        self._cancel_nudge_commit()
+        if not self._pending_nudge: return
+        item, old_state = self._pending_nudge
+        self._pending_nudge = None
+        if item.get_state() != old_state:
+            self.log_action((f'edit_{item.kind}', item, old_state, item.get_state()))
+
+    def schedule_redraw(self):
+        """Coalesces bursts of redraw requests (key repeat, rapid undo/redo) into one draw at the next idle tick."""
+        if self._draw_pending: return
+        self._draw_pending = True
+        self.after_idle(self._flush_redraw)
+
+    def _flush_redraw(self):
+        self._draw_pending = False
         self.draw_blueprint()
 
     def prompt_add_room_precise(self):
@@ -267,7 +453,7 @@ class BlueprintApp(ttk.Window):
             self.draw_blueprint()
 
     def copy_room(self):
-        if isinstance(self.selected_item, Room):
+        if self.selected_item and self.selected_item.kind == 'room':
             self.clipboard = self.selected_item.get_state()
             self.update_buttons()
 
@@ -295,12 +481,14 @@ class BlueprintApp(ttk.Window):
         self.house.append(Room("Master Bedroom", random.uniform(0, lr_w - mbr_w), lr_h, mbr_w, mbr_h))
         b_w, b_h = random.uniform(*templates["Bathroom"]['w']), random.uniform(*templates["Bathroom"]['h'])
         self.house.append(Room("Bathroom", lr_w, self.house[1].y + k_h, b_w, b_h))
+        self._geometry_dirty = True
         self.update_buttons(); self.draw_blueprint()
 
     #! MODIFIED: Rewritten to better prioritize moving vs. resizing.
     def on_press(self, event):
         if event.inaxes != self.ax or self.toolbar.mode:
             return
+        self._commit_nudge() # A deferred nudge commit must not fire mid-drag and log the drag's geometry
         self.action_start_xy = (event.xdata, event.ydata)
 
         # Handle placing a new object
@@ -311,14 +499,15 @@ class BlueprintApp(ttk.Window):
         # Handle double-click to edit properties
         if event.dblclick:
             item = self.find_item_at(event.xdata, event.ydata)
-            if isinstance(item, Room): self.prompt_edit_room_properties(item)
-            elif isinstance(item, BlueprintObject): self.prompt_edit_object_properties(item)
+            if not item: return
+            if item.kind == 'room': self.prompt_edit_room_properties(item)
+            else: self.prompt_edit_object_properties(item)
             return
 
         # Determine user's intent: resize, move, or draw
         item_under_cursor = self.find_item_at(event.xdata, event.ydata)
         resize_handle = None
-        if isinstance(item_under_cursor, Room):
+        if item_under_cursor and item_under_cursor.kind == 'room':
             resize_handle = item_under_cursor.get_resize_handle(event.xdata, event.ydata)
 
         # --- Action Logic ---
@@ -328,44 +517,45 @@ class BlueprintApp(ttk.Window):
             self.current_action = 'resizing_room'
             self.resize_handle = resize_handle
             self.original_state = self.selected_item.get_state()
+            return
         
         # 2. MOVE or SELECT: If any item is clicked (even on an edge), select and prepare to move it.
         elif item_under_cursor:
             self.select_item(item_under_cursor) # Select the item immediately
             self.current_action = 'moving'
             self.original_state = self.selected_item.get_state()
+            return
             
         # 3. DRAW: If the canvas is empty and draw mode is on.
         elif self.draw_mode_active.get():
             self.select_item(None) # Deselect any previously selected item
             self.current_action = 'drawing_room'
-            self.ghost_rect = patches.Rectangle(self.action_start_xy, 0, 0, facecolor='#18BC9C', alpha=0.4)
+            self.ghost_rect = patches.Rectangle(self.action_start_xy, 0, 0, facecolor='#18BC9C', alpha=0.4, animated=True)
             self.ax.add_patch(self.ghost_rect)
+            self._blit_animated()
             
         # 4. DESELECT: If clicking on an empty area without draw mode.
         else:
             self.select_item(None)
 
-        self.draw_blueprint()
-
     def on_motion(self, event):
         if not event.inaxes or self.toolbar.mode: return
         
         # Ghost preview for placing a new object
         if self.object_to_add:
-            w, h = self.object_templates[self.object_to_add]
+            w, h = self._object_to_add_wh
             if not self.ghost_rect:
-                self.ghost_rect = patches.Rectangle((0,0), w, h, facecolor='#F39C12', alpha=0.6)
+                self.ghost_rect = patches.Rectangle((0,0), w, h, facecolor='#F39C12', alpha=0.6, animated=True)
                 self.ax.add_patch(self.ghost_rect)
             self.ghost_rect.set_xy((event.xdata - w/2, event.ydata - h/2))
-            self.canvas.draw_idle()
+            self._blit_animated()
             return
         
         # Update cursor based on context if no action is in progress
         if not self.current_action:
             cursor = 'arrow'
             # Check for resize handle only on the currently selected item
-            if isinstance(self.selected_item, Room) and self.selected_item.get_resize_handle(event.xdata, event.ydata):
+            if self.selected_item and self.selected_item.kind == 'room' and self.selected_item.get_resize_handle(event.xdata, event.ydata):
                 cursor = 'plus' 
             elif self.find_item_at(event.xdata, event.ydata):
                 cursor = 'fleur' # Move cursor
@@ -394,15 +584,100 @@ class BlueprintApp(ttk.Window):
             if 'top' in self.resize_handle: nh = max(1, y - oy)
             if 'bottom' in self.resize_handle: nh, ny = max(1, (oy + oh) - y), y
             self.selected_item.update_state((n, nx, ny, nw, nh))
-        
+
+        if self.current_action in ['moving', 'resizing_room'] and self._drag_item is None:
+            self._begin_blit() # Deferred so a plain click never hides the item
+        self._blit_animated()
+
+    def _begin_blit(self):
+        """Hides the selected item from the scene so it is only drawn by the animated highlight and label."""
+        self._drag_item = self.selected_item
+        self._labels[self._drag_item].set_animated(True)
+        self._bg = None # Wait for the next full draw to cache a background without the item
         self.draw_blueprint()
 
+    def _end_blit(self):
+        if self._drag_item in self._labels: self._labels[self._drag_item].set_animated(False)
+        self._drag_item = None
+
+    def _animated_artists(self):
+        self._update_highlight()
+        artists = [self._highlight]
+        if self._drag_item in self._labels:
+            self._update_label(self._drag_item)
+            artists.append(self._labels[self._drag_item])
+        if self.ghost_rect: artists.append(self.ghost_rect)
+        return artists
+
+    def _update_highlight(self):
+        item = self.selected_item
+        self._highlight.set_visible(item in self._labels) # Selected items can be stale after undo/delete
+        if not self._highlight.get_visible(): return
+        is_room = item.kind == 'room'
+        face = PALETTE['room_face' if is_room else 'obj_face'] if item is self._drag_item else 'none'
+        self._highlight.set_facecolor(face)
+        self._highlight.set_edgecolor(PALETTE['selected_edge' if is_room else 'selected_obj_edge'])
+        self._highlight.set_linewidth(2.5 if is_room else 2.0)
+        self._highlight.set_bounds(item.x, item.y, max(0.1, item.width), max(0.1, item.height))
+
+    def _blit_animated(self):
+        """Repaints only the animated artists over the cached background."""
+        if self._bg is None:
+            self.canvas.draw_idle() # Nothing cached yet; the pending full draw paints them
+            return
+        artists = self._animated_artists()
+        self.canvas.restore_region(self._bg)
+        for artist in artists: self.ax.draw_artist(artist)
+        self.canvas.blit(self.ax.bbox)
+
+    def _on_draw(self, event):
+        # Every full draw (first paint, resize, layout change) refreshes the background the animated artists sit on.
+        # savefig prints through temporary PDF/SVG canvases, or through this one at the print dpi for PNG
+        if event.canvas is not self.canvas or self.canvas.is_saving(): return
+        self._bg = self.canvas.copy_from_bbox(self.ax.bbox)
+        for artist in self._animated_artists(): self.ax.draw_artist(artist)
+
+    def _label_scale(self):
+        """Returns the current zoom as screen pixels per foot along x and y."""
+        self.ax.apply_aspect() # The equal-aspect box is otherwise only adjusted at draw time
+        (x0, y0), (x1, y1) = self.ax.transData.transform([(0, 0), (1, 1)])
+        return abs(x1 - x0), abs(y1 - y0)
+
+    def _refresh_labels(self):
+        scale = self._labels_scale = self._label_scale()
+        for item in self._labels: self._update_label(item, scale)
+
+    def _on_view_changed(self, *args):
+        # A zoom sets xlim then ylim; check once both are in, ahead of the draw the caller queues
+        if self._view_check_pending: return
+        self._view_check_pending = True
+        self.after_idle(self._check_label_scale)
+
+    def _check_label_scale(self):
+        self._view_check_pending = False
+        # Pans keep the scale, so only zooms and resizes need the labels re-evaluated
+        if self._label_scale() == self._labels_scale: return
+        self._refresh_labels()
+        self.canvas.draw_idle()
+
+    def _update_label(self, item, scale=None):
+        w, h = max(0.1, item.width), max(0.1, item.height)
+        sx, sy = scale or self._label_scale()
+        text = self._labels[item]
+        # Text layout is expensive; skip it entirely for items too small to fit a readable label
+        text.set_visible(bool(w * sx >= MIN_LABEL_PX[0] and h * sy >= MIN_LABEL_PX[1]))
+        if not text.get_visible(): return
+        text.set_position((item.x + w / 2, item.y + h / 2))
+        text.set_text(self._label_for(item, w, h))
+
+    def _label_for(self, item, w, h):
+        if item.kind == 'room':
+            return f"{self.format_text_for_room(item.name, w)}\n({w * h:.2f} sqft)"
+        return item.name
+
     def on_release(self, event):
         if not self.current_action: return
-        
-        item_type = None
-        if isinstance(self.selected_item, Room): item_type = 'room'
-        elif isinstance(self.selected_item, BlueprintObject): item_type = 'obj'
+        needs_redraw = self._drag_item is not None # Its collection row was hidden during the drag
 
         if self.current_action == 'drawing_room' and self.ghost_rect:
             w, h = self.ghost_rect.get_width(), self.ghost_rect.get_height()
@@ -415,16 +690,19 @@ class BlueprintApp(ttk.Window):
                     nr = Room(name, x_start, y_start, abs(w), abs(h))
                     self.house.append(nr)
                     self.log_action(('add_room', nr, nr.get_state(), None))
+                    needs_redraw = True
             if self.ghost_rect in self.ax.patches:
                 self.ghost_rect.remove()
             self.ghost_rect = None
+            if not needs_redraw: self._blit_animated() # The ghost was only ever blitted; restore the background
 
         elif self.current_action in ['moving', 'resizing_room']:
             if self.selected_item and self.selected_item.get_state() != self.original_state:
-                self.log_action((f'edit_{item_type}', self.selected_item, self.original_state, self.selected_item.get_state()))
+                self.log_action((f'edit_{self.selected_item.kind}', self.selected_item, self.original_state, self.selected_item.get_state()))
 
+        self._end_blit()
         self.current_action, self.original_state, self.resize_handle = None, None, None
-        self.draw_blueprint()
+        if needs_redraw: self.draw_blueprint() # A click that only selected has already been blitted
 
     def on_scroll(self, event):
         if event.inaxes != self.ax: return
@@ -440,12 +718,14 @@ class BlueprintApp(ttk.Window):
         self.canvas.draw_idle()
 
     def find_item_at(self, x, y):
-        # Check furnishings first as they are "on top"
-        for obj in reversed(self.furnishings):
-            if obj.contains(x, y): return obj
-        for room in reversed(self.house):
-            if room.contains(x, y): return room
-        return None
+        self._sync_geometry()
+        # Furnishings rank above rooms and later items above earlier ones; the highest-ranked hit wins
+        best = -1
+        for rank in reversed(self._grid.get((int(x // GRID_CELL_SIZE), int(y // GRID_CELL_SIZE)), ())):
+            if self._z_items[rank].contains(x, y): best = rank; break
+        hits = np.flatnonzero(_points_in_rects(self._overflow_xywh, x, y))
+        if hits.size: best = max(best, int(self._overflow_ranks[hits[-1]]))
+        return self._z_items[best] if best >= 0 else None
 
     def prompt_edit_room_properties(self, room):
         old_state = room.get_state()
@@ -481,11 +761,12 @@ class BlueprintApp(ttk.Window):
     def enter_add_object_mode(self):
         self.cancel_action()
         self.object_to_add = self.object_combo.get()
+        self._object_to_add_wh = self.object_templates[self.object_to_add] # Looked up once, not per motion event
         self.canvas.get_tk_widget().config(cursor='tcross')
 
     def add_object_at(self, x, y):
         name = self.object_to_add
-        w, h = self.object_templates[name]
+        w, h = self._object_to_add_wh
         new_obj = BlueprintObject(name, x - w/2, y - h/2, w, h)
         self.furnishings.append(new_obj)
         self.log_action(('add_obj', new_obj, new_obj.get_state(), None))
@@ -501,38 +782,84 @@ class BlueprintApp(ttk.Window):
         if clear_draw_mode:
             self.draw_mode_active.set(False)
         
-        self.current_action = None
+        # Abandon an in-progress move/resize: put the item back where the press found it
+        if self.current_action in ['moving', 'resizing_room'] and self.selected_item and self.original_state:
+            self.selected_item.update_state(self.original_state)
+            self._geometry_dirty = True
+        self._end_blit()
+        self.current_action, self.original_state, self.resize_handle = None, None, None
         self.canvas.get_tk_widget().config(cursor='arrow')
         self.draw_blueprint()
 
     def undo(self):
+        self._commit_nudge()
         if not self.history: return
         action, item, s1, s2 = self.history.pop()
+        old_state = item.get_state()
         if action == 'add_room': self.house.remove(item)
         elif action == 'delete_room': self.house.append(item); item.update_state(s1)
         elif action == 'edit_room': item.update_state(s1)
         elif action == 'add_obj': self.furnishings.remove(item)
         elif action == 'delete_obj': self.furnishings.append(item); item.update_state(s1)
         elif action == 'edit_obj': item.update_state(s1)
-        self.redo_stack.append((action, item, s1, s2)); self.update_buttons(); self.draw_blueprint()
+        self.redo_stack.append((action, item, s1, s2)); self.update_buttons()
+        self._refresh_after_history_step(action, item, old_state)
 
     def redo(self):
+        self._commit_nudge()
         if not self.redo_stack: return
         action, item, s1, s2 = self.redo_stack.pop()
+        old_state = item.get_state()
         if action == 'add_room': self.house.append(item)
         elif action == 'delete_room': self.house.remove(item)
         elif action == 'edit_room': item.update_state(s2)
         elif action == 'add_obj': self.furnishings.append(item)
         elif action == 'delete_obj': self.furnishings.remove(item)
         elif action == 'edit_obj': item.update_state(s2)
-        self.history.append((action, item, s1, s2)); self.update_buttons(); self.draw_blueprint()
+        self.history.append((action, item, s1, s2)); self.update_buttons()
+        self._refresh_after_history_step(action, item, old_state)
+
+    def _refresh_after_history_step(self, action, item, old_state):
+        if action.startswith('edit_'):
+            if item.get_state() == old_state: return # No-op step; nothing on screen changes
+            self._redraw_item(item)
+        else:
+            self._geometry_dirty = True
+            self.schedule_redraw() # Adds/deletes change the set of labels and collection rows
+
+    def _redraw_item(self, item):
+        """Patches one edited item's geometry row, grid cells, collection path and label in place."""
+        is_room = item.kind == 'room'
+        items, xywh, collection = ((self.house, self.room_xywh, self._room_collection) if is_room
+                                   else (self.furnishings, self.obj_xywh, self._obj_collection))
+        if self._geometry_dirty or self._draw_pending or item not in self._labels:
+            # Arrays or artists are already out of date; let the queued full redraw pick this up too
+            self._geometry_dirty = True
+            self.schedule_redraw()
+            return
+        i = items.index(item)
+        old_row, new_row = xywh[i].copy(), np.array(item.get_state()[1:], dtype=float)
+        xywh[i] = new_row
+        rank = i if is_room else len(self.house) + i
+        self._grid_remove(rank, old_row); self._grid_insert(rank, new_row)
+        if is_room:
+            self._total_sqft += float(np.maximum(new_row[2:], 0.1).prod() - np.maximum(old_row[2:], 0.1).prod())
+        corners = _rect_verts(new_row[None])[0]
+        collection.get_paths()[i] = Path(np.vstack((corners, corners[:1])), closed=True)
+        collection.stale = True
+        self._update_label(item)
+        self.total_sqft_label.config(text=f"Total Area: {self._total_sqft:.2f} sqft")
+        self.canvas.draw_idle()
     
     def clear_blueprint(self, confirm=True):
         if confirm and not messagebox.askyesno("Confirm", "This will clear the layout and all history. Continue?", parent=self):
             return
+        self._cancel_nudge_commit(); self._pending_nudge = None
         self.house.clear(); self.furnishings.clear(); self.history.clear(); self.redo_stack.clear()
+        self._geometry_dirty = True
         self.select_item(None)
         self.update_buttons()
+        self.draw_blueprint()
 
     def delete_selected_item(self, event=None):
         if not self.selected_item: return
@@ -544,100 +871,87 @@ class BlueprintApp(ttk.Window):
         item = self.selected_item
         old_state = item.get_state()
         
-        if isinstance(item, Room):
+        if item.kind == 'room':
             self.house.remove(item)
             self.log_action(('delete_room', item, old_state, None))
-        elif isinstance(item, BlueprintObject):
+        else:
             self.furnishings.remove(item)
             self.log_action(('delete_obj', item, old_state, None))
         
         self.select_item(None)
+        self.draw_blueprint()
 
     def select_item(self, item):
         if self.selected_item != item:
+            self._commit_nudge()
             self.selected_item = item
             self.update_buttons()
-            self.draw_blueprint() # Redraw on selection change
+            self._blit_animated() # Only the highlight moves
 
     def update_buttons(self):
-        is_room_selected = isinstance(self.selected_item, Room)
+        is_room_selected = bool(self.selected_item) and self.selected_item.kind == 'room'
         self.copy_button.config(state=NORMAL if is_room_selected else DISABLED)
         self.paste_button.config(state=NORMAL if self.clipboard else DISABLED)
 
     def format_text_for_room(self, name, width):
         avg_char_width = 0.6 
-        chars_per_line = max(1, int(width / avg_char_width))
-        wrapper = textwrap.TextWrapper(width=chars_per_line, break_long_words=True, break_on_hyphens=False)
-        wrapped_lines = wrapper.wrap(text=name)
-        return '\n'.join(wrapped_lines)
+        return _wrap_name(name, max(1, int(width / avg_char_width)))
 
     def draw_blueprint(self):
-        xlim_before, ylim_before = self.ax.get_xlim(), self.ax.get_ylim()
-        self.ax.clear()
-        
-        palette = {
-            'bg': '#2B3E50', 'text': '#EAEAEA', 'grid': '#4E6A85', 
-            'room_face': '#34495E', 'room_edge': '#9CC2E5', 'selected_edge': '#18BC9C',
-            'obj_face': '#8E44AD', 'obj_edge': '#BD93D8', 'selected_obj_edge': '#F39C12',
-        }
-        
-        self.fig.patch.set_facecolor(palette['bg'])
-        self.ax.set_facecolor(palette['bg'])
-        self.ax.tick_params(colors=palette['text'], which='both')
-        for spine in self.ax.spines.values(): spine.set_edgecolor(palette['grid'])
-        
-        self.ax.set_title("FloorLayoutGen", color=palette['text'], weight='bold', fontsize=16)
-        self.ax.set_xlabel("Width (feet)", color=palette['text'])
-        self.ax.set_ylabel("Height (feet)", color=palette['text'])
-        
-        total_sqft = 0
-        for r in self.house:
-            w, h = max(0.1, r.width), max(0.1, r.height)
-            area = w * h; total_sqft += area
-            ec, lw = (palette['selected_edge'], 2.5) if r == self.selected_item else (palette['room_edge'], 1.5)
-            p = patches.Rectangle((r.x, r.y), w, h, edgecolor=ec, facecolor=palette['room_face'], linewidth=lw, zorder=2)
-            self.ax.add_patch(p)
-            
-            wrapped_name = self.format_text_for_room(r.name, w)
-            full_text = f"{wrapped_name}\n({area:.2f} sqft)"
-            self.ax.text(r.x + w / 2, r.y + h / 2, full_text, 
-                         ha='center', va='center', fontsize=8, color=palette['text'], wrap=True, zorder=5)
-        
-        for obj in self.furnishings:
-            w, h = max(0.1, obj.width), max(0.1, obj.height)
-            ec, lw = (palette['selected_obj_edge'], 2.0) if obj == self.selected_item else (palette['obj_edge'], 1.0)
-            p = patches.Rectangle((obj.x, obj.y), w, h, edgecolor=ec, facecolor=palette['obj_face'], linewidth=lw, zorder=4)
-            self.ax.add_patch(p)
-            self.ax.text(obj.x + w / 2, obj.y + h / 2, obj.name,
-                         ha='center', va='center', fontsize=6, color=palette['text'], wrap=True, zorder=5)
-
-        self.total_sqft_label.config(text=f"Total Area: {total_sqft:.2f} sqft")
+        self._update_axes_limits() # Before syncing, so label sizing sees the final limits
+        self._sync_artists()
+        self.canvas.draw_idle()
 
-        if self.ghost_rect and self.ghost_rect not in self.ax.patches:
-            self.ax.add_patch(self.ghost_rect)
-        
-        is_first_draw = xlim_before == (0.0, 1.0) and ylim_before == (0.0, 1.0)
+    def _sync_artists(self):
+        """Refreshes both collections from the geometry arrays and keeps one persistent label per item."""
+        self._sync_geometry()
+        self._sync_collection(self._room_collection, self.house, self.room_xywh,
+                              PALETTE['room_face'], PALETTE['room_edge'], 1.5)
+        self._sync_collection(self._obj_collection, self.furnishings, self.obj_xywh,
+                              PALETTE['obj_face'], PALETTE['obj_edge'], 1.0)
+
+        for items, fontsize in ((self.house, 8), (self.furnishings, 6)):
+            for item in items:
+                if item not in self._labels:
+                    self._labels[item] = self.ax.text(item.x, item.y, '', ha='center', va='center', fontsize=fontsize,
+                                                      color=PALETTE['text'], wrap=True, zorder=5)
+
+        live_items = set(self.house) | set(self.furnishings)
+        for item in [i for i in self._labels if i not in live_items]:
+            self._labels.pop(item).remove()
+        self._refresh_labels()
+
+        self.total_sqft_label.config(text=f"Total Area: {self._total_sqft:.2f} sqft")
+
+    def _sync_collection(self, collection, items, xywh, face, edge, lw):
+        facecolors = np.tile(to_rgba(face), (len(items), 1))
+        edgecolors = np.tile(to_rgba(edge), (len(items), 1))
+        if self._drag_item in items:
+            i = items.index(self._drag_item)
+            facecolors[i] = edgecolors[i] = (0, 0, 0, 0) # Drawn by the animated highlight instead
+        collection.set_verts(_rect_verts(xywh))
+        collection.set_facecolor(facecolors); collection.set_edgecolor(edgecolors); collection.set_linewidth(lw)
+
+    def _update_axes_limits(self):
+        # Only the very first draw autoscales; afterwards the user's pan/zoom is left untouched.
+        if self.ax.get_xlim() != (0.0, 1.0) or self.ax.get_ylim() != (0.0, 1.0): return
+        self._sync_geometry()
         if self.house or self.furnishings:
-            all_items = self.house + self.furnishings
-            all_x = [item.x for item in all_items] + [item.x + item.width for item in all_items]
-            all_y = [item.y for item in all_items] + [item.y + item.height for item in all_items]
-            if is_first_draw and all_x and all_y:
-                min_x, max_x = min(all_x), max(all_x)
-                min_y, max_y = min(all_y), max(all_y)
-                x_margin = max(5, (max_x - min_x) * 0.1)
-                y_margin = max(5, (max_y - min_y) * 0.1)
-                self.ax.set_xlim(min_x - x_margin, max_x + x_margin)
-                self.ax.set_ylim(min_y - y_margin, max_y + y_margin)
-            else:
-                self.ax.set_xlim(xlim_before); self.ax.set_ylim(ylim_before)
-        elif is_first_draw:
-            self.ax.set_xlim(0, 50); self.ax.set_ylim(0, 50)
+            all_xywh = np.vstack((self.room_xywh, self.obj_xywh))
+            min_x, min_y = np.min(all_xywh[:, :2], axis=0)
+            max_x, max_y = np.max(all_xywh[:, :2] + all_xywh[:, 2:], axis=0)
+            x_margin = max(5, (max_x - min_x) * 0.1)
+            y_margin = max(5, (max_y - min_y) * 0.1)
+            self.ax.set_xlim(min_x - x_margin, max_x + x_margin)
+            self.ax.set_ylim(min_y - y_margin, max_y + y_margin)
         else:
-            self.ax.set_xlim(xlim_before); self.ax.set_ylim(ylim_before)
-        
-        self.ax.set_aspect('equal', adjustable='box')
-        self.ax.grid(True, linestyle='--', color=palette['grid'], alpha=0.6, zorder=0)
-        self.canvas.draw_idle()
+            self.ax.set_xlim(0, 50); self.ax.set_ylim(0, 50)
+
+# --- Navigation toolbar without per-motion work ---
+class QuietToolbar(NavigationToolbar2Tk):
+    """Skips the coordinate readout and cursor update the stock toolbar runs on every mouse move."""
+    def mouse_move(self, event):
+        pass
 
 # --- Helper class for Tooltips ---
 class ToolTip: